@@ -6,20 +6,92 @@ This script uses Mistral AI to generate project blueprints, creates the folder s
 and automates GitHub Copilot to write the actual code using pyautogui.
 """
 
+import functools
+import hashlib
 import json
 import os
+import queue
+import re
+import shlex
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple, Union
 
+import diskcache
 import requests
 import pyautogui
+import pyperclip
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 MISTRAL_API_KEY = "Input-your-mistral-api-key"  # Replace with actual API key
 MISTRAL_API_URL = "https://api.mistral.ai/v1/chat/completions"
+MISTRAL_MODEL = "mistral-large-latest"
+MISTRAL_CONNECT_TIMEOUT = 10  # seconds to establish a connection
+MISTRAL_TIMEOUT = 60  # seconds to wait for the response
+HEDGE_DELAY = 8  # seconds before firing a duplicate request
+CACHE_DIR = Path.home() / ".auto_forge_cache"
+
+
+def _json_loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Decode JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Encode JSON with a 2-space indent, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+# Markdown code fence that Mistral sometimes wraps around the JSON; either side may be missing
+_FENCE = re.compile(r"^(?:```(?:json)?)?\s*(.*?)\s*(?:```)?\s*$", re.DOTALL)
+
+# Topic keywords used to pick a fallback blueprint
+_WEB_KWS = frozenset({"web", "website", "html", "css", "js"})
+_API_KWS = frozenset({"api", "server", "backend"})
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_blueprint(json_string: str) -> Dict[str, Any]:
+    """Parse and validate a raw blueprint response, memoized on the raw text.
+
+    The returned dict is shared between calls and must not be mutated.
+    """
+    # Clean the response in case there's markdown formatting
+    json_string = _FENCE.match(json_string.strip()).group(1)
+    
+    structure = _json_loads(json_string)
+    
+    # Validate required fields
+    if "folders" not in structure:
+        structure["folders"] = []
+    if "files" not in structure:
+        structure["files"] = []
+    if "interactions" not in structure:
+        structure["interactions"] = ""
+    
+    # Validate file objects
+    for file_obj in structure["files"]:
+        if not all(key in file_obj for key in ["path", "description", "copilot_prompt"]):
+            raise ValueError(f"Invalid file object: {file_obj}")
+    
+    return structure
 
 
 class MistralPlanner:
@@ -31,31 +103,38 @@ class MistralPlanner:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
-        # Fallback blueprint for when API fails
-        self.fallback_structure = {
-            "folders": ["src", "tests", "docs"],
-            "files": [
-                {
-                    "path": "src/main.py",
-                    "description": "Main application entry point",
-                    "copilot_prompt": "Create a Python main.py file that serves as the entry point for the application"
-                },
-                {
-                    "path": "tests/test_main.py", 
-                    "description": "Unit tests for main module",
-                    "copilot_prompt": "Create pytest unit tests for the main.py module"
-                },
-                {
-                    "path": "README.md",
-                    "description": "Project documentation",
-                    "copilot_prompt": "Create a comprehensive README.md file for this project"
-                }
-            ],
-            "interactions": "Basic project structure with main application file, tests, and documentation.",
-            "test_command": "pytest tests"
-        }
+        # Pooled session so retries and later calls reuse the TLS connection.
+        # Connection errors and transient status codes are retried with
+        # exponential backoff by urllib3; read timeouts are not, so a hung
+        # endpoint costs a single MISTRAL_TIMEOUT.
+        retries = Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"])
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+        # On-disk cache of blueprints so repeated topics skip the API call
+        self.cache = diskcache.Cache(str(CACHE_DIR))
+    
+    def __enter__(self) -> "MistralPlanner":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
-    def build_prompt(self, topic: str) -> str:
+    def close(self) -> None:
+        """Close the HTTP session and the blueprint cache."""
+        self.session.close()
+        self.cache.close()
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def build_prompt(topic: str) -> str:
         """Build the prompt for Mistral to generate project structure."""
         return f"""You are a professional AI software architect and project planner. Your job is to produce a detailed, JSON-formatted blueprint for a software project.
 
@@ -76,8 +155,14 @@ Respond with only the JSON, no additional text."""
         """Send request to Mistral API and return the response."""
         prompt = self.build_prompt(topic)
         
+        # Return a cached blueprint if this exact prompt was answered before
+        key = hashlib.sha256((prompt + MISTRAL_MODEL).encode()).hexdigest()
+        if key in self.cache:
+            print("Using cached blueprint...")
+            return self.cache[key]
+        
         payload = {
-            "model": "mistral-large-latest",
+            "model": MISTRAL_MODEL,
             "messages": [
                 {
                     "role": "user",
@@ -88,44 +173,120 @@ Respond with only the JSON, no additional text."""
             "temperature": 0.3
         }
         
-        # Try multiple times with increasing timeouts
-        timeouts = [30, 60, 90]
+        try:
+            print(f"Calling Mistral API (timeout: {MISTRAL_TIMEOUT}s)...")
+            content = self._post_hedged(payload)
+            
+            # Only cache replies that parse as a valid blueprint, so a bad
+            # reply is not replayed on every later run
+            try:
+                _parse_blueprint(content)
+            except (ValueError, TypeError):
+                pass
+            else:
+                self.cache.set(key, content)
+            return content
         
-        for attempt, timeout in enumerate(timeouts, 1):
+        except requests.exceptions.RequestException as e:
+            print(f"API Error: {e}")
+            print("All API attempts failed. Using fallback structure...")
+            return self._get_fallback_structure(topic)
+            
+        except (KeyError, IndexError, ValueError) as e:
+            print(f"Error parsing Mistral response: {e}")
+            return self._get_fallback_structure(topic)
+    
+    def _post(self, payload: Dict[str, Any]) -> str:
+        """Send a single request to Mistral and return the message content."""
+        with self.session.post(MISTRAL_API_URL, json=payload, stream=True,
+                               timeout=(MISTRAL_CONNECT_TIMEOUT, MISTRAL_TIMEOUT)) as response:
+            response.raise_for_status()
+            data = self._read_json(response)
+        
+        return data["choices"][0]["message"]["content"].strip()
+    
+    @staticmethod
+    def _read_json(response: requests.Response) -> Dict[str, Any]:
+        """Read a streamed JSON body, returning as soon as the document is complete."""
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=4096):
+            buffer += chunk
+            if buffer.rstrip().endswith(b"}"):
+                try:
+                    return _json_loads(buffer)
+                except ValueError:
+                    continue  # Closing brace of a nested object, keep reading
+        
+        # Stream ended without an early parse; decode whatever was received
+        return _json_loads(buffer)
+    
+    def _post_hedged(self, payload: Dict[str, Any]) -> str:
+        """Send the request, firing a duplicate if the first one is slow, and return the first success."""
+        results: "queue.Queue[Tuple[Optional[str], Optional[Exception]]]" = queue.Queue()
+        
+        def worker() -> None:
             try:
-                print(f"Attempting API call {attempt}/{len(timeouts)} (timeout: {timeout}s)...")
-                response = requests.post(MISTRAL_API_URL, headers=self.headers, json=payload, timeout=timeout)
-                response.raise_for_status()
-                
-                data = response.json()
-                return data["choices"][0]["message"]["content"].strip()
+                results.put((self._post(payload), None))
+            except Exception as e:
+                results.put((None, e))
+        
+        def start() -> None:
+            # Daemon threads, so a losing request never holds up interpreter exit
+            threading.Thread(target=worker, daemon=True).start()
+        
+        start()
+        pending, hedged, error = 1, False, None
+        while pending:
+            try:
+                content, exc = results.get(timeout=None if hedged else HEDGE_DELAY)
+            except queue.Empty:
+                print(f"No response after {HEDGE_DELAY}s, sending hedged request...")
+                start()
+                pending += 1
+                hedged = True
+                continue
             
-            except requests.exceptions.Timeout as e:
-                print(f"Timeout on attempt {attempt}: {e}")
-                if attempt == len(timeouts):
-                    print("All API attempts failed. Using fallback structure...")
-                    return self._get_fallback_structure(topic)
-                time.sleep(2)  # Wait before retry
-                
-            except requests.exceptions.RequestException as e:
-                print(f"API Error on attempt {attempt}: {e}")
-                if attempt == len(timeouts):
-                    print("All API attempts failed. Using fallback structure...")
-                    return self._get_fallback_structure(topic)
-                time.sleep(2)
-                
-            except (KeyError, IndexError) as e:
-                print(f"Error parsing Mistral response: {e}")
-                if attempt == len(timeouts):
-                    return self._get_fallback_structure(topic)
-                time.sleep(2)
+            pending -= 1
+            if exc is None:
+                return content
+            error = exc
+        raise error
+    
+    @classmethod
+    def _default_template(cls, topic: str) -> Dict[str, Any]:
+        """Build a fresh generic Python blueprint for the topic."""
+        return {
+            "folders": ["src", "tests", "docs"],
+            "files": [
+                {
+                    "path": "src/main.py",
+                    "description": "Main application entry point",
+                    "copilot_prompt": f"Create a Python application for {topic} with proper structure and functionality"
+                },
+                {
+                    "path": "tests/test_main.py",
+                    "description": "Unit tests for main module",
+                    "copilot_prompt": "Create pytest unit tests for the main.py module"
+                },
+                {
+                    "path": "README.md",
+                    "description": "Project documentation",
+                    "copilot_prompt": "Create a comprehensive README.md file for this project"
+                }
+            ],
+            "interactions": f"A Python project for {topic} with main application, tests, and documentation.",
+            "test_command": "pytest tests"
+        }
     
     def _get_fallback_structure(self, topic: str) -> str:
         """Generate a fallback structure based on the topic."""
-        # Customize fallback based on topic keywords
+        # Customize fallback based on topic keywords. Whole-word hits are a cheap
+        # fast path; the substring check keeps matching plurals and compounds
+        # such as "websites", "nodejs" or "APIs".
         topic_lower = topic.lower()
+        tokens = set(re.findall(r"\w+", topic_lower))
         
-        if any(word in topic_lower for word in ['web', 'website', 'html', 'css', 'js']):
+        if tokens & _WEB_KWS or any(word in topic_lower for word in _WEB_KWS):
             structure = {
                 "folders": ["src", "assets", "css", "js", "tests"],
                 "files": [
@@ -148,7 +309,7 @@ Respond with only the JSON, no additional text."""
                 "interactions": f"A web project for {topic} with HTML structure, CSS styling, and JavaScript functionality working together to create an interactive website.",
                 "test_command": ""
             }
-        elif any(word in topic_lower for word in ['api', 'server', 'backend']):
+        elif tokens & _API_KWS or any(word in topic_lower for word in _API_KWS):
             structure = {
                 "folders": ["src", "tests", "config"],
                 "files": [
@@ -173,42 +334,14 @@ Respond with only the JSON, no additional text."""
             }
         else:
             # Generic Python project
-            structure = self.fallback_structure.copy()
-            structure["interactions"] = f"A Python project for {topic} with main application, tests, and documentation."
-            
-            # Customize the main file prompt based on topic
-            for file_obj in structure["files"]:
-                if file_obj["path"] == "src/main.py":
-                    file_obj["copilot_prompt"] = f"Create a Python application for {topic} with proper structure and functionality"
+            structure = self._default_template(topic)
         
-        return json.dumps(structure, indent=2)
+        return _json_dumps(structure)
     
     def parse_structure(self, json_string: str) -> Dict[str, Any]:
         """Parse and validate the JSON structure from Mistral."""
         try:
-            # Clean the response in case there's markdown formatting
-            json_string = json_string.strip()
-            if json_string.startswith('```json'):
-                json_string = json_string[7:]
-            if json_string.endswith('```'):
-                json_string = json_string[:-3]
-            
-            structure = json.loads(json_string)
-            
-            # Validate required fields
-            if "folders" not in structure:
-                structure["folders"] = []
-            if "files" not in structure:
-                structure["files"] = []
-            if "interactions" not in structure:
-                structure["interactions"] = ""
-            
-            # Validate file objects
-            for file_obj in structure["files"]:
-                if not all(key in file_obj for key in ["path", "description", "copilot_prompt"]):
-                    raise ValueError(f"Invalid file object: {file_obj}")
-            
-            return structure
+            return _parse_blueprint(json_string)
         
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON: {e}")
@@ -222,50 +355,55 @@ Respond with only the JSON, no additional text."""
 class StructureCreator:
     """Creates the project folder structure and files based on the blueprint."""
     
-    def __init__(self, desktop_path: Optional[str] = None):
+    # Characters that are invalid in folder names
+    _INVALID_NAME = re.compile(r'[<>:"/\\|?*]')
+    
+    def __init__(self, desktop_path: Optional[str] = None, incremental: bool = True):
         if desktop_path is None:
             self.desktop_path = Path.home() / "Desktop"
         else:
             self.desktop_path = Path(desktop_path)
+        # Reuse an existing project folder, rewriting only files whose content changed
+        self.incremental = incremental
+        # Progress messages, written to stdout in one batch per project
+        self._log: List[str] = []
     
     def create_structure(self, topic: str, structure: Dict[str, Any]) -> Path:
         """Create the complete project structure on desktop."""
+        self._log = []
+        try:
+            return self._create_structure(topic, structure)
+        finally:
+            # Report progress even if creation failed part way through
+            sys.stdout.write("\n".join(self._log) + "\n")
+            sys.stdout.flush()
+    
+    def _create_structure(self, topic: str, structure: Dict[str, Any]) -> Path:
+        """Create the project folder, folders and files, logging progress to self._log."""
         # Create project folder
         project_name = self._sanitize_name(topic)
         project_path = self.desktop_path / project_name
         
-        # Remove existing project if it exists
-        if project_path.exists():
-            import shutil
-            shutil.rmtree(project_path)
-        
-        project_path.mkdir(parents=True, exist_ok=True)
-        print(f"Created project folder: {project_path}")
-        
-        # Create folders
-        for folder in structure["folders"]:
-            folder_path = project_path / folder
-            folder_path.mkdir(parents=True, exist_ok=True)
-            print(f"Created folder: {folder}")
-        
-        # Create files
+        if self.incremental:
+            project_path.mkdir(parents=True, exist_ok=True)
+        else:
+            # Create a fresh project folder, replacing any existing one
+            try:
+                project_path.mkdir(parents=True)
+            except FileExistsError:
+                shutil.rmtree(project_path)
+                project_path.mkdir(parents=True)
+        self._log.append(f"Project folder: {project_path}")
+        
+        # Create files with description and copilot prompt as comments
+        contents: Dict[Path, str] = {}
         for file_obj in structure["files"]:
-            file_path = project_path / file_obj["path"]
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write file with description and copilot prompt as comments
-            content = f"""# Description: {file_obj['description']}
+            contents[project_path / file_obj["path"]] = f"""# Description: {file_obj['description']}
 # Copilot Prompt: {file_obj['copilot_prompt']}
 
 """
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            print(f"Created file: {file_obj['path']}")
         
         # Create README.md with interactions
-        readme_path = project_path / "README.md"
         readme_content = f"""# {topic}
 
 ## Project Structure
@@ -283,42 +421,86 @@ This project was generated automatically. Each file contains a Copilot prompt th
 Run tests with: `{structure['test_command']}`
 
 """
+        contents[project_path / "README.md"] = readme_content
+        
+        needed_dirs = {project_path / folder for folder in structure["folders"]}
+        needed_dirs |= {file_path.parent for file_path in contents}
         
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        # Clear stale paths first, so an old file can't block a folder of the same name
+        if self.incremental:
+            self._remove_stale(project_path, contents, needed_dirs)
+        
+        # Create every folder (declared or implied by a file path) exactly once
+        for dir_path in sorted(needed_dirs, key=lambda d: len(d.parts)):
+            dir_path.mkdir(parents=True, exist_ok=True)
+        self._log.extend(f"Created folder: {folder}" for folder in structure["folders"])
+        
+        # File I/O releases the GIL, so write the files concurrently
+        items = list(contents.items())
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            written = list(executor.map(self._write_one, items))
+        
+        for (file_path, _), was_written in zip(items, written):
+            status = "Created file" if was_written else "Unchanged file"
+            self._log.append(f"{status}: {file_path.relative_to(project_path).as_posix()}")
         
-        print("Created README.md")
         return project_path
     
+    def _remove_stale(self, project_path: Path, contents: Dict[Path, str], needed_dirs: Set[Path]) -> None:
+        """Remove files and empty folders that are no longer part of the blueprint."""
+        existing = list(project_path.rglob("*"))
+        for path in existing:
+            if path.is_file() and (path not in contents or path in needed_dirs):
+                path.unlink()
+                self._log.append(f"Removed file: {path.relative_to(project_path).as_posix()}")
+        
+        # Deepest first, so emptied parents can be removed too
+        for path in sorted(existing, key=lambda p: len(p.parts), reverse=True):
+            if path.is_dir() and path not in needed_dirs and not any(path.iterdir()):
+                path.rmdir()
+    
+    @staticmethod
+    def _write_one(item: Tuple[Path, str]) -> bool:
+        """Write a single (path, content) pair to disk, skipping identical files.
+
+        Returns True if the file was written.
+        """
+        file_path, content = item
+        try:
+            if file_path.read_text(encoding='utf-8') == content:
+                return False
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+        file_path.write_text(content, encoding='utf-8')
+        return True
+    
     def _sanitize_name(self, name: str) -> str:
         """Sanitize the project name for use as a folder name."""
-        # Remove or replace invalid characters
-        import re
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', name)
-        sanitized = sanitized.strip('. ')
-        return sanitized[:50]  # Limit length
+        # Replace invalid characters and limit length
+        return self._INVALID_NAME.sub('_', name).strip('. ')[:50]
 
 
 class CopilotAutomator:
     """Automates VS Code and GitHub Copilot using pyautogui."""
     
     def __init__(self):
-        # Configure pyautogui
-        pyautogui.PAUSE = 0.8
+        # Configure pyautogui; keep the per-call pause small and wait
+        # explicitly only where VS Code or Copilot actually need time
+        pyautogui.PAUSE = 0.05
         pyautogui.FAILSAFE = True
     
     def launch_vscode(self, project_path: Path) -> bool:
         """Launch VS Code with the project folder."""
-        commands = ["code", "code.cmd"]
-        
-        for cmd in commands:
+        # Resolve the executable up front instead of spawning failing candidates
+        exe = shutil.which("code") or shutil.which("code.cmd")
+        if exe:
             try:
-                subprocess.run([cmd, str(project_path)], check=True, capture_output=True)
-                print(f"Launched VS Code with: {cmd}")
+                subprocess.Popen([exe, str(project_path)])
+                print(f"Launched VS Code with: {exe}")
                 time.sleep(5)  # Wait for VS Code to open
                 return True
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                continue
+            except OSError as e:
+                print(f"Failed to launch VS Code: {e}")
         
         # Fallback: open in file explorer
         try:
@@ -339,23 +521,21 @@ class CopilotAutomator:
         
         # First, open README.md for context
         self._open_file("README.md")
-        time.sleep(2)
         
         # Process each file
         for file_obj in structure["files"]:
             print(f"Processing file: {file_obj['path']}")
             self._process_file(file_obj)
-            time.sleep(2)
     
     def _open_file(self, filename: str) -> None:
         """Open a file using VS Code quick open."""
         # Use Ctrl+P for quick open
         pyautogui.hotkey('ctrl', 'p')
-        time.sleep(1)
+        time.sleep(0.5)  # Wait for the quick open panel
         
         # Type filename
         pyautogui.write(filename)
-        time.sleep(1)
+        time.sleep(0.5)  # Wait for quick open to filter its results
         
         # Press Enter
         pyautogui.press('enter')
@@ -368,15 +548,13 @@ class CopilotAutomator:
         
         # Move to end of file (after the comments)
         pyautogui.hotkey('ctrl', 'end')
-        time.sleep(0.5)
         
         # Trigger Copilot inline chat with Ctrl+I
         pyautogui.hotkey('ctrl', 'i')
         time.sleep(2)  # Wait for Copilot chat to appear
         
-        # Type the prompt into Copilot's chat interface
-        pyautogui.write(file_obj['copilot_prompt'])
-        time.sleep(1)
+        # Paste the prompt into Copilot's chat interface
+        self._paste_text(file_obj['copilot_prompt'])
         
         # Press Enter to send the prompt to Copilot
         pyautogui.press('enter')
@@ -384,24 +562,37 @@ class CopilotAutomator:
         
         # Accept the suggestion (usually Tab or Ctrl+Enter)
         pyautogui.press('tab')
-        time.sleep(1)
         
         # Alternative: If Tab doesn't work, try Ctrl+Enter
         # pyautogui.hotkey('ctrl', 'enter')
         
         # Save file
         pyautogui.hotkey('ctrl', 's')
-        time.sleep(1)
+        time.sleep(1)  # Let VS Code finish saving before the next file
         
         print(f"✓ Processed {file_obj['path']}")
+    
+    def _paste_text(self, text: str) -> None:
+        """Enter text via the clipboard with a single Ctrl+V instead of typing it."""
+        try:
+            previous = pyperclip.paste()
+            pyperclip.copy(text)
+        except pyperclip.PyperclipException:
+            # No clipboard mechanism available (e.g. Linux without xclip/xsel), type it instead
+            pyautogui.write(text)
+            return
+        
+        pyautogui.hotkey('ctrl', 'v')
+        time.sleep(0.2)  # Let VS Code read the clipboard before restoring it
+        pyperclip.copy(previous)
 
 
 class TestRunner:
     """Handles test execution and error fixing."""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, automator: CopilotAutomator):
         self.project_path = project_path
-        self.copilot_automator = CopilotAutomator()
+        self.copilot_automator = automator
     
     def run_tests(self, test_command: str, max_attempts: int = 3) -> bool:
         """Run tests and fix errors using Copilot."""
@@ -417,29 +608,29 @@ class TestRunner:
                 return True
         
         print(f"Running tests with command: {test_command}")
+        try:
+            # POSIX quoting would drop the backslashes in Windows paths
+            argv = shlex.split(test_command, posix=os.name != "nt")
+        except ValueError as e:
+            print(f"Invalid test command: {e}")
+            return False
         
         for attempt in range(max_attempts):
             print(f"Test attempt {attempt + 1}/{max_attempts}")
             
             try:
-                result = subprocess.run(
-                    test_command.split(),
-                    cwd=self.project_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
+                returncode, stdout, stderr = self._run_command(argv)
                 
-                if result.returncode == 0:
+                if returncode == 0:
                     print("Tests passed!")
                     return True
                 else:
-                    print(f"Tests failed with return code: {result.returncode}")
-                    print(f"STDOUT: {result.stdout}")
-                    print(f"STDERR: {result.stderr}")
+                    print(f"Tests failed with return code: {returncode}")
+                    print(f"STDOUT: {stdout}")
+                    print(f"STDERR: {stderr}")
                     
                     # Create error fix file
-                    self._create_error_fix_file(result.stderr, result.stdout)
+                    self._create_error_fix_file(stderr, stdout)
                     
                     # Attempt to fix with Copilot
                     self._fix_with_copilot()
@@ -456,6 +647,41 @@ class TestRunner:
         print("Failed to fix tests after maximum attempts")
         return False
     
+    def _run_command(self, argv: List[str], timeout: int = 60, max_lines: int = 200) -> Tuple[int, str, str]:
+        """Run the test command, keeping only the last lines of stdout and stderr."""
+        tail_out: Deque[str] = deque(maxlen=max_lines)
+        tail_err: Deque[str] = deque(maxlen=max_lines)
+        
+        proc = subprocess.Popen(
+            argv,
+            cwd=self.project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace"
+        )
+        # Drain both pipes concurrently so neither can fill up and block the process
+        pipes = ((proc.stdout, tail_out), (proc.stderr, tail_err))
+        readers = [threading.Thread(target=tail.extend, args=(pipe,), daemon=True) for pipe, tail in pipes]
+        for reader in readers:
+            reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            # A background child that inherited the pipes can keep them open,
+            # so only wait briefly and leave such pipes to the daemon readers
+            deadline = time.monotonic() + 1
+            for reader, (pipe, _) in zip(readers, pipes):
+                reader.join(timeout=max(0, deadline - time.monotonic()))
+                if not reader.is_alive():
+                    pipe.close()
+        
+        return proc.returncode, "".join(tail_out), "".join(tail_err)
+    
     def _create_error_fix_file(self, stderr: str, stdout: str) -> None:
         """Create a file with error information for Copilot to fix."""
         error_file = self.project_path / "copilot_error_fix.txt"
@@ -473,8 +699,7 @@ Please identify the root cause of these errors and provide fixes for the relevan
 Focus on syntax errors, missing imports, incorrect function signatures, and logical issues.
 """
         
-        with open(error_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        error_file.write_text(content, encoding='utf-8')
         
         print("Created copilot_error_fix.txt")
     
@@ -484,20 +709,17 @@ Focus on syntax errors, missing imports, incorrect function signatures, and logi
         
         # Open the error fix file
         self.copilot_automator._open_file("copilot_error_fix.txt")
-        time.sleep(2)
         
         # Trigger Copilot to analyze the errors
         pyautogui.hotkey('ctrl', 'i')
         time.sleep(2)
         
-        pyautogui.write("Analyze these test errors and suggest fixes for the project files")
-        time.sleep(1)
+        self.copilot_automator._paste_text("Analyze these test errors and suggest fixes for the project files")
         
         pyautogui.press('enter')
         time.sleep(5)  # Wait for analysis
         
         pyautogui.press('tab')  # Accept suggestions
-        time.sleep(1)
 
 
 def main():
@@ -514,9 +736,9 @@ def main():
         # Step 1: Generate blueprint with Mistral
         print("\n1. Generating project blueprint with Mistral AI...")
         print("⚠️  Note: If API fails, will use intelligent fallback structure")
-        planner = MistralPlanner(MISTRAL_API_KEY)
-        json_response = planner.ask(topic)
-        structure = planner.parse_structure(json_response)
+        with MistralPlanner(MISTRAL_API_KEY) as planner:
+            json_response = planner.ask(topic)
+            structure = planner.parse_structure(json_response)
         print("✓ Blueprint generated successfully")
         
         # Show what was generated
@@ -548,7 +770,7 @@ def main():
         # Step 4: Run tests if specified
         if structure.get("test_command"):
             print("\n4. Running tests...")
-            test_runner = TestRunner(project_path)
+            test_runner = TestRunner(project_path, automator)
             success = test_runner.run_tests(structure["test_command"])
             
             if success: